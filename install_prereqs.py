@@ -9,10 +9,20 @@ import sys
 import subprocess
 import shutil
 
+COLORS = {'r': '\033[31m', 'g': '\033[32m', 'y': '\033[33m', '': ''}
+END = '\033[0m'
+
 def printc(msg, color):
-    colors = {'r': '\033[31m', 'g': '\033[32m', 'y': '\033[33m', '': ''}
-    end = '\033[0m'
-    print(f"{colors.get(color, '')}{msg}{end}")
+    print(f"{COLORS.get(color, '')}{msg}{END}")
+
+def _is_installed(pip_name):
+    # read dist-info metadata only; importing heavy packages like torch just to probe takes seconds
+    from importlib.metadata import distribution, PackageNotFoundError
+    try:
+        distribution(pip_name)
+    except PackageNotFoundError:
+        return False
+    return True
 
 def _ensure_packages():
     import importlib
@@ -23,30 +33,23 @@ def _ensure_packages():
         ("numpy", "numpy"),
     ]
     missing = []
-    for mod_name, pip_name in pkgs:
-        try:
-            importlib.import_module(mod_name)
-        except ImportError:
+    for _, pip_name in pkgs:
+        if not _is_installed(pip_name):
             missing.append(pip_name)
     # Special handling for numpy: try conda first
     if "numpy" in missing:
         printc("'numpy' not found. Attempting to install with conda...", 'y')
         if shutil.which('conda') is not None:
             conda_proc = subprocess.run(["conda", "install", "-y", "numpy"])
-            if conda_proc.returncode == 0:
+            # conda on PATH may belong to a different environment than sys.executable, so re-check
+            if conda_proc.returncode == 0 and _is_installed("numpy"):
                 printc("'numpy' installed with conda. You may now run your main script.", 'g')
                 missing.remove("numpy")
             else:
                 printc("Conda install failed or numpy not found in environment. Trying pip...", 'r')
         else:
             printc("'conda' is not available. Will try pip for 'numpy'.", 'y')
-    # Now, check for anything still missing
-    missing = []
-    for mod_name, pip_name in pkgs:
-        try:
-            importlib.import_module(mod_name)
-        except ImportError:
-            missing.append(pip_name)
+    # Now, pip install anything still missing (numpy was dropped above only if conda put it in this environment)
     if missing:
         printc("Missing: " + ', '.join(missing), 'r')
         print("Attempting to install missing dependencies with pip...")
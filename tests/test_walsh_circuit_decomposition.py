@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
-from walsh_circuit_decomposition import gray_code, Walsh_coefficients, build_optimal_walsh_circuit
+import torch
+from walsh_circuit_decomposition import gray_code, _fwht, Walsh_coefficients, build_optimal_walsh_circuit
 
 def test_gray_code():
     """Test gray code generation for different bit lengths"""
@@ -9,6 +10,26 @@ def test_gray_code():
     # Test for 3-bit gray code
     assert gray_code(3) == [0, 1, 3, 2, 6, 7, 5, 4]
 
+def _sylvester_hadamard(N):
+    H = np.array([[1.0]])
+    while H.shape[0] < N:
+        H = np.kron(H, np.array([[1, 1], [1, -1]]))
+    return H
+
+def test_fwht_matches_hadamard_matrix():
+    """Test the fast Walsh-Hadamard transform against an explicit Sylvester Hadamard matrix"""
+    rng = np.random.default_rng(0)
+    for N in [1, 2, 4, 8, 16]:
+        v = rng.standard_normal(N)
+        assert np.allclose(_fwht(v), _sylvester_hadamard(N) @ v, atol=1e-12)
+
+def test_fwht_integer_noncontiguous_input():
+    """Test that integer, strided input is transformed without modifying the original"""
+    base = np.arange(32)
+    v = base[::2]  # 16 ints, non-contiguous view
+    assert np.allclose(_fwht(v), _sylvester_hadamard(16) @ v, atol=1e-12)
+    assert np.array_equal(base, np.arange(32))
+
 def test_walsh_coefficients():
     """Test Walsh coefficient calculation for diagonal matrices"""
     # Test with identity matrix (2x2)
@@ -24,6 +45,12 @@ def test_walsh_coefficients():
     # The first coefficient should be 0 (global phase) and second should be π/2
     assert np.allclose(coeffs[1], np.pi/2, atol=1e-12)
 
+def test_walsh_coefficients_torch_input():
+    """Test that a grad-tracking torch tensor gives the same coefficients as numpy input"""
+    matrix = np.diag(np.exp(1j * np.array([0, np.pi/4, np.pi/2, np.pi])))
+    tensor = torch.tensor(matrix, requires_grad=True)
+    assert np.allclose(Walsh_coefficients(tensor), Walsh_coefficients(matrix), atol=1e-12)
+
 def test_build_optimal_walsh_circuit():
     """Test circuit construction for simple diagonal matrices"""
     # Test with a simple phase gate
@@ -5,6 +5,7 @@ import numpy as np
 # from qiskit import QuantumCircuit
 # from qiskit.circuit.library import RZGate
 from collections import defaultdict
+from functools import lru_cache
 import pennylane as qml
 import torch
 
@@ -13,30 +14,41 @@ import torch
 def gray_code(n: int):
     return [i ^ (i >> 1) for i in range(1 << n)]
 
+@lru_cache(maxsize=None)
+def _gray_groups(n: int):
+    # grouping of gray-code indices by target qubit only depends on n, so build it once per qubit count
+    groups = defaultdict(list)
+    for j in gray_code(n):
+        if j == 0:
+            continue  # skip a0
+        target = j.bit_length() - 1
+        groups[target].append(j)
+    return tuple((target, tuple(groups[target])) for target in sorted(groups))
+
 def _fwht(vec: np.ndarray) -> np.ndarray:
     
     y = vec.astype(float).copy()
     h, N = 1, y.size
     while h < N:
-        for i in range(0, N, h*2):
-            for j in range(i, i+h):
-                u, v = y[j], y[j+h]
-                y[j], y[j+h] = u+v, u-v
+        # view as (blocks, 2, h) so each butterfly stage is one slice op instead of a python loop
+        blocks = y.reshape(-1, 2, h)
+        u = blocks[:, 0].copy()
+        blocks[:, 0] += blocks[:, 1]
+        blocks[:, 1] = u - blocks[:, 1]
         h <<= 1
     return y
 
 def Walsh_coefficients(matrix: np.ndarray) -> np.ndarray:
-    # fix for err (RuntimeError: Can't call numpy() on Tensor that requires grad. Use tensor.detach().numpy() instead.)
-    try:
-        if isinstance(matrix, torch.Tensor):
-            matrix = matrix.detach().numpy()
-    except Exception:
-        pass
     assert matrix.ndim == 2 and matrix.shape[0] == matrix.shape[1]
     N = matrix.shape[0]
     assert N & (N-1) == 0 and N > 0
     
-    d = np.diag(matrix)
+    # only the diagonal is used, so take it before leaving torch instead of copying the whole matrix
+    # fix for err (RuntimeError: Can't call numpy() on Tensor that requires grad. Use tensor.detach().numpy() instead.)
+    if isinstance(matrix, torch.Tensor):
+        d = matrix.detach().diagonal().cpu().numpy()
+    else:
+        d = np.diag(matrix)
     # assert np.allclose(matrix, np.diag(d))
     # assert np.allclose(np.abs(d), 1.0, atol=1e-12)
 
@@ -53,19 +65,11 @@ def build_optimal_walsh_circuit(matrix):
     
     # qc = QuantumCircuit(n)
     qc = []
-    gray_seq = gray_code(n)
-    groups = defaultdict(list)
-    for j in gray_seq:
-        if j == 0:
-            continue  # skip a0
-        target = j.bit_length() - 1
-        groups[target].append(j)
 
     def controls_of(j, target):
         return [q for q in range(n) if ((j >> q) & 1) and q != target]
 
-    for target in sorted(groups):
-        seq = groups[target]
+    for target, seq in _gray_groups(n):
         if not seq:
             continue
 